@@ -1,19 +1,27 @@
-from fastapi import FastAPI, UploadFile, File,HTTPException,Response
+from fastapi import FastAPI, UploadFile, File,HTTPException,Response,Query
 from fastapi.responses import JSONResponse,FileResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 from pathlib import Path
-import shutil, subprocess, json
+import shutil
 from fastapi.middleware.cors import CORSMiddleware
 from app.services.analysis import analyze_stub, Insights
 from app.agents.tools import act_on_action_item
 from app.agents.graph import build_workflow
-from app.services.transcription import transcribe
+from app.services.transcription import transcribe, transcribe_with_probe
+from app.services.transcript_store import save_transcript, get_transcript
 from app.utils.ics import create_ics
 
 from typing import Optional, List, Dict, Any
 
 app = FastAPI(title="Post-Meeting Agent (Milestone 2: Master Agent)")
 workflow = build_workflow()
+# Compress large responses: br when brotli-asgi is installed (with gzip fallback), else gzip only
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=1000, gzip_fallback=True)
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
 # Allow CORS for local frontend
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +47,77 @@ class EventIn(BaseModel):
     attendees: list[str] = []
     idempotency_key: str | None = None
 
+# ---------- Response models ----------
+# Declaring a response_model lets FastAPI/Pydantic serialize straight to JSON bytes.
+# Every field is optional and routes use response_model_exclude_unset=True, so
+# ?fields= projections and the compact/full profiles only emit the keys they set.
+class IngestOut(BaseModel):
+    file_path: Optional[str] = None
+    transcript_id: Optional[str] = None
+    insights: Optional[Dict[str, Any]] = None
+    actions: Optional[List[Dict[str, Any]]] = None
+    task_owners: Optional[List[Dict[str, Any]]] = None
+    transcript: Optional[str] = None
+    summary: Optional[str] = None
+    decisions: Optional[List[str]] = None
+    action_items: Optional[List[Dict[str, Any]]] = None
+
+class ActOut(BaseModel):
+    insights: Optional[Dict[str, Any]] = None
+    actions: Optional[List[Dict[str, Any]]] = None
+
+class TranscriptOut(BaseModel):
+    transcript_id: str
+    transcript: str
+
+# ---------- Response shaping helpers ----------
+RESPONSE_PROFILES = ("compact", "full")
+INGEST_FIELDS = {
+    "compact": ("file_path", "transcript_id", "insights", "actions", "task_owners"),
+    "full": ("file_path", "transcript_id", "insights", "actions", "task_owners",
+             "transcript", "summary", "decisions", "action_items"),
+}
+ACT_FIELDS = ("insights", "actions")
+
+def _dump(model: BaseModel) -> Dict[str, Any]:
+    """Pydantic v2 model_dump (fast path) with v1 .dict() fallback."""
+    return model.model_dump() if hasattr(model, "model_dump") else model.dict()
+
+def _project(payload: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    """
+    Keep only the requested fields, e.g. ?fields=insights.summary,actions
+    One level of nesting is supported via 'parent.child'; unknown names are a 422.
+    """
+    if not fields:
+        return payload
+    out: Dict[str, Any] = {}
+    unknown: List[str] = []
+    for f in (x.strip() for x in fields.split(",")):
+        if not f:
+            continue
+        key, _, sub = f.partition(".")
+        if key not in payload:
+            unknown.append(f)
+        elif not sub:
+            out[key] = payload[key]
+        elif isinstance(payload[key], dict) and sub in payload[key]:
+            out.setdefault(key, {})[sub] = payload[key][sub]
+        else:
+            unknown.append(f)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown field(s): {unknown}; available: {list(payload)}")
+    return out
+
+def _check_fields(fields: Optional[str], allowed: tuple) -> None:
+    """Reject unknown top-level field names up front, before any expensive work."""
+    unknown = [f for f in (x.strip() for x in (fields or "").split(",")) if f and f.partition(".")[0] not in allowed]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown field(s): {unknown}; available: {list(allowed)}")
+
+def _check_profile(profile: str) -> None:
+    if profile not in RESPONSE_PROFILES:
+        raise HTTPException(status_code=422, detail=f"profile must be one of {list(RESPONSE_PROFILES)}")
+
 @app.get("/health")
 def health():
     return {"ok": True, "version": "m2-hotfix2"}  
@@ -47,12 +126,13 @@ def health():
 def analyze_text(inp: TranscriptIn):
     return analyze_stub(inp.transcript)
 
-@app.post("/act_on_text")
-def act_on_text(inp: TranscriptIn):
+@app.post("/act_on_text", response_model=ActOut, response_model_exclude_unset=True)
+def act_on_text(inp: TranscriptIn, fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. insights.summary,actions")):
     """
     Returns analysis + a PREVIEW of actions (no GitHub/event creation).
     Use /actions/task and /actions/event to actually create.
     """
+    _check_fields(fields, ACT_FIELDS)
     insights = analyze_stub(inp.transcript)
 
     
@@ -64,7 +144,7 @@ def act_on_text(inp: TranscriptIn):
             "ics_path": None,   
         })
 
-    return {"insights": insights.dict(), "actions": preview_actions}
+    return _project({"insights": _dump(insights), "actions": preview_actions}, fields)
 
 @app.post("/debug_transcribe")
 async def debug_transcribe(file: UploadFile = File(...)):
@@ -73,40 +153,40 @@ async def debug_transcribe(file: UploadFile = File(...)):
         fpath = path / file.filename
         with open(fpath, "wb") as f: shutil.copyfileobj(file.file, f)
 
-        # quick ffprobe for visibility
-        def ffprobe_json(p):
-            try:
-                out = subprocess.check_output([
-                    "ffprobe","-hide_banner","-loglevel","error",
-                    "-show_streams","-select_streams","a","-of","json", str(p)
-                ], text=True)
-                return json.loads(out)
-            except Exception as e:
-                return {"probe_error": str(e)}
-
-        transcript = transcribe(str(fpath))
-        return {"file_path": str(fpath), "probe": ffprobe_json(str(fpath)), "transcript": transcript}
+        # probe comes from the same in-process header pass used by the transcriber (no ffprobe fork)
+        transcript, probe = transcribe_with_probe(str(fpath))
+        return {"file_path": str(fpath), "probe": probe, "transcript": transcript}
     except Exception as e:
         import traceback
         return JSONResponse(status_code=500, content={"error": str(e), "traceback": traceback.format_exc()})
 
 # ---------- Ingest audio (Transcribe + Analyze ONLY) ----------
-@app.post("/ingest_audio")
-async def ingest_audio(file: UploadFile = File(...)):
+@app.post("/ingest_audio", response_model=IngestOut, response_model_exclude_unset=True)
+async def ingest_audio(
+    file: UploadFile = File(...),
+    profile: str = Query("compact", description="compact (default) or full (legacy shape incl. transcript)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. transcript_id,insights.summary"),
+):
     """
     Decoupled pipeline:
       1) Save file
       2) Transcribe
       3) Analyze
       4) Return insights + PREVIEW actions (no creation here)
+    The compact profile returns `transcript_id` instead of the transcript text
+    (fetch it via GET /transcripts/{transcript_id}) and no duplicated top-level fields.
     """
+    _check_profile(profile)
+    _check_fields(fields, INGEST_FIELDS[profile])
     try:
         path = Path("data/meetings"); path.mkdir(parents=True, exist_ok=True)
         fpath = path / file.filename
         with open(fpath, "wb") as f: shutil.copyfileobj(file.file, f)
         transcript = transcribe(str(fpath))
         print(f"Transcript:\n{transcript}")
+        transcript_id = save_transcript(transcript)
         insights = analyze_stub(transcript)
+        insights_dict = _dump(insights)
 
         preview_actions: List[Dict[str, Any]] = []
         for ai in insights.action_items:
@@ -116,14 +196,11 @@ async def ingest_audio(file: UploadFile = File(...)):
                 "ics_path": None,
             })
 
-        return {
+        payload = {
             "file_path": str(fpath),
-            "transcript": transcript,
-            "insights": insights.dict(),
+            "transcript_id": transcript_id,
+            "insights": insights_dict,
             "actions": preview_actions,    
-            "summary": insights.summary,
-            "decisions": insights.decisions,
-            "action_items": [ai.dict() for ai in insights.action_items],
             "task_owners": (
                 [
                     {"owner": ai.owner, "github_username": getattr(ai, "github_username", None)}
@@ -131,10 +208,27 @@ async def ingest_audio(file: UploadFile = File(...)):
                 ] + [{"owner": "Mrinali", "github_username": "mrinali488"}]
             )
         }
+        if profile == "full":
+            payload.update({
+                "transcript": transcript,
+                "summary": insights_dict["summary"],
+                "decisions": insights_dict["decisions"],
+                "action_items": insights_dict["action_items"],
+            })
+        return _project(payload, fields)
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         return JSONResponse(status_code=500, content={"error": str(e), "traceback": traceback.format_exc()})
 
+@app.get("/transcripts/{transcript_id}", response_model=TranscriptOut)
+def transcript_by_id(transcript_id: str):
+    text = get_transcript(transcript_id)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Transcript not found (unknown id or evicted)")
+    return {"transcript_id": transcript_id, "transcript": text}
+
 def _normalize_task_result(item: TaskIn, action: Dict[str, Any]) -> Dict[str, Any]:
     
     return {
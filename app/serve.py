@@ -0,0 +1,181 @@
+"""
+Multi-process serving mode (Linux/macOS):
+
+    python -m app.serve --workers 4 --port 8000
+
+The master imports the app once (OpenAI/GitHub clients, LangGraph workflow), so that
+Python-level state is shared copy-on-write, and makes sure the Whisper model files are
+downloaded. The models themselves are loaded by each worker after the fork (CTranslate2
+thread pools do not survive fork()). Each worker is pinned to its own slice of CPUs and its
+Whisper intra-op threads are sized to that slice, so N workers never oversubscribe the machine.
+Crashing workers are restarted with exponential backoff and given up on if they keep crashing.
+Every response carries an `x-worker-pid` header so load tests can see which worker served it.
+Shared state (transcripts) lives in SQLite, see app.services.transcript_store.
+"""
+import argparse
+import os
+import random
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Dict, List
+
+import uvicorn
+
+MAX_CRASHES = 5          # crashes of one worker within CRASH_WINDOW before we stop restarting it
+CRASH_WINDOW = 60.0      # seconds
+MAX_BACKOFF = 30.0       # seconds
+
+
+def _cpu_slices(workers: int) -> List[List[int]]:
+    """Split the CPUs this process may use into `workers` contiguous, non-empty slices."""
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    if workers >= len(cpus):
+        return [[cpus[i % len(cpus)]] for i in range(workers)]
+    per, extra = divmod(len(cpus), workers)
+    slices, start = [], 0
+    for i in range(workers):
+        end = start + per + (1 if i < extra else 0)
+        slices.append(cpus[start:end])
+        start = end
+    return slices
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError("must be >= 1")
+    return n
+
+def _with_pid_header(asgi_app):
+    """Tag every HTTP response with the worker pid that produced it."""
+    pid_header = (b"x-worker-pid", str(os.getpid()).encode())
+
+    async def wrapped(scope, receive, send):
+        if scope["type"] != "http":
+            return await asgi_app(scope, receive, send)
+
+        async def send_with_pid(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), pid_header]}
+            await send(message)
+
+        await asgi_app(scope, receive, send_with_pid)
+    return wrapped
+
+def _bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def _run_worker(idx: int, cpus: List[int], sock: socket.socket, args) -> None:
+    """Child process body: pin CPUs, size thread pools, serve until signalled."""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    threads = str(args.threads_per_worker or len(cpus))
+    # read by get_model() when this worker first loads Whisper (CTranslate2 cpu_threads)
+    os.environ["WHISPER_CPU_THREADS"] = threads
+    random.seed()    # forked workers inherit the master's RNG state (task ids use random)
+
+    from app.main import app
+    config = uvicorn.Config(_with_pid_header(app), log_level=args.log_level, workers=1)
+    server = uvicorn.Server(config)
+    print(f"[serve] worker {idx} pid={os.getpid()} cpus={cpus} threads={threads}", flush=True)
+    server.run(sockets=[sock])
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Pre-forking server for the Post-Meeting Agent API")
+    ap.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    ap.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    ap.add_argument("--workers", type=_positive_int, default=os.getenv("WEB_CONCURRENCY", "1"))
+    ap.add_argument("--threads-per-worker", type=int, default=int(os.getenv("THREADS_PER_WORKER", "0")),
+                    help="Whisper intra-op threads per worker (default: size of the worker's CPU slice)")
+    ap.add_argument("--no-model-download", action="store_true",
+                    help="Skip downloading/resolving Whisper model files in the master")
+    ap.add_argument("--log-level", default="info")
+    args = ap.parse_args()
+    if not hasattr(os, "fork"):
+        sys.exit("app.serve needs fork(); use `uvicorn app.main:app` on this platform")
+
+    slices = _cpu_slices(args.workers)
+    # OpenMP/BLAS runtimes (numpy, CTranslate2) read this when first imported, which happens
+    # below in the master, so it has to be set before the import rather than in the workers
+    os.environ.setdefault("OMP_NUM_THREADS", str(args.threads_per_worker or max(len(s) for s in slices)))
+
+    # Everything imported here is shared copy-on-write with the workers
+    import app.main  # noqa: F401
+    if not args.no_model_download:
+        from app.services.transcription import resolve_model_files
+        print(f"[serve] Whisper model files resolved (each worker loads its own copy): "
+              f"{resolve_model_files()}", flush=True)
+
+    sock = _bind(args.host, args.port)
+    children: Dict[int, int] = {}    # pid -> worker index
+    crashes: Dict[int, List[float]] = {i: [] for i in range(args.workers)}
+    stopping = False
+
+    def spawn(idx: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                _run_worker(idx, slices[idx], sock, args)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        children[pid] = idx
+
+    def stop(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    print(f"[serve] master pid={os.getpid()} listening on http://{args.host}:{args.port} "
+          f"with {args.workers} worker(s)", flush=True)
+    for i in range(args.workers):
+        spawn(i)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        idx = children.pop(pid, None)
+        if idx is None or stopping:
+            continue
+        now = time.monotonic()
+        recent = crashes[idx] = [t for t in crashes[idx] if now - t < CRASH_WINDOW] + [now]
+        code = os.waitstatus_to_exitcode(status)
+        if len(recent) >= MAX_CRASHES:
+            print(f"[serve] worker {idx} (pid={pid}) exited with {code} {len(recent)} times in "
+                  f"{CRASH_WINDOW:.0f}s; not restarting it", flush=True)
+            continue
+        delay = min(MAX_BACKOFF, 2.0 ** (len(recent) - 1))
+        print(f"[serve] worker {idx} (pid={pid}) exited with {code}; restarting in {delay:.0f}s", flush=True)
+        time.sleep(delay)
+        if not stopping:
+            spawn(idx)
+    sock.close()
+    if not stopping:
+        sys.exit("[serve] all workers gave up; see the tracebacks above")
+
+if __name__ == "__main__":
+    main()
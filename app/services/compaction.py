@@ -0,0 +1,198 @@
+import os
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.services.heuristics import extract_due_phrase, split_multi_owner
+
+# ---------- CONFIG / DEFAULTS ----------
+COMPACTION_ENABLED = os.getenv("COMPACTION_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+COMPACTION_TOKEN_BUDGET = int(os.getenv("COMPACTION_TOKEN_BUDGET", "0"))   # 0 = no sentence ranking
+CHARS_PER_TOKEN = 4          # rough average for English text with OpenAI tokenizers
+MAX_LOOP_NGRAM = 8           # longest phrase we look for when collapsing Whisper repetition loops
+MIN_LOOP_REPEATS = 3         # "bye bye" / "had had" are speech; Whisper loops repeat 3+ times
+
+# Pure disfluencies only; ambiguous words ("er", "like", "mm" as in "5 mm") are left alone,
+# and hyphenated backchannels ("uh-huh", "mm-hmm") are kept whole.
+FILLER_RE = re.compile(r"(?<!-)\b(?:u+m+|u+h+|uhm|erm|a+h+|hmm+)\b(?!-),?\s*", flags=re.IGNORECASE)
+# "you know" / "I mean" are fillers only when set off by commas ("so, you know, we ...")
+MID_PHRASE_FILLER_RE = re.compile(r",\s*(?:you know|i mean)\s*,", flags=re.IGNORECASE)
+LEAD_PHRASE_FILLER_RE = re.compile(r"(?:^|(?<=[.!?]\s))(?:you know|i mean),\s*", flags=re.IGNORECASE)
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+WORD_RE = re.compile(r"[a-z0-9']+")
+PUNCT = ",.!?;:"
+
+DECISION_CUE_RE = re.compile(
+    r"\b(?:decide[ds]?|decision|agree[ds]?|approve[ds]?|final|going with|let's|we'll|will|need to|"
+    r"must|should|deadline|due|action items?|follow[- ]up|owners?|assign(?:ed)?)\b"
+)
+STOPWORDS = {
+    "the", "a", "an", "and", "or", "but", "to", "of", "in", "on", "for", "with", "is", "it",
+    "that", "this", "be", "we", "i", "you", "so", "are", "was", "at", "as", "do", "just",
+    "okay", "ok", "yeah", "right", "like", "really", "think", "going",
+}
+
+
+class CompactionStats(BaseModel):
+    original_tokens: int
+    compacted_tokens: int
+    tokens_saved: int
+    sentences_dropped: int = 0
+    token_budget: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars/token); good enough for budgeting, no tokenizer needed."""
+    text = (text or "").strip()
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+def strip_fillers(text: str) -> str:
+    """Drop filler words ('um', 'uh') and comma-delimited ', you know,' / ', I mean,'."""
+    text = MID_PHRASE_FILLER_RE.sub("", text)
+    text = LEAD_PHRASE_FILLER_RE.sub("", text)
+    text = FILLER_RE.sub("", text)
+    text = re.sub(r"\s+([,.!?;])", r"\1", text)
+    text = re.sub(r"[,;]+\s*([.!?])", r"\1", text)          # "ship, uh." -> "ship,." -> "ship."
+    text = re.sub(r"([,;])(?:\s*[,;])+", r"\1", text)
+    return re.sub(r"\s{2,}", " ", text).strip(" ,")
+
+def _norm(token: str) -> str:
+    return token.lower().strip(PUNCT)
+
+def _has_digit(tokens: List[str]) -> bool:
+    return any(ch.isdigit() for t in tokens for ch in t)
+
+def collapse_repeats(text: str, max_n: int = MAX_LOOP_NGRAM, min_repeats: int = MIN_LOOP_REPEATS) -> str:
+    """
+    Collapse n-grams repeated back to back `min_repeats`+ times (Whisper loops from
+    condition_on_previous_text), keeping the punctuation of the last repeat:
+    'thank you thank you thank you.' -> 'thank you.'
+    N-grams containing digits are data ('555 555 555'), not loops, and are kept.
+    """
+    words = text.split()
+    keys = [_norm(w) for w in words]
+    out: List[str] = []
+    i = 0
+    while i < len(words):
+        for n in range(1, max_n + 1):
+            count = 1
+            while keys[i + count * n:i + (count + 1) * n] == keys[i:i + n]:
+                count += 1
+            if count >= min_repeats and any(keys[i:i + n]) and not _has_digit(keys[i:i + n]):
+                last = i + count * n - 1
+                out.extend(words[i:i + n - 1])
+                out.append(words[i + n - 1].rstrip(PUNCT) + words[last][len(words[last].rstrip(PUNCT)):])
+                i += count * n
+                break
+        else:
+            out.append(words[i])
+            i += 1
+    return " ".join(out)
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in SENTENCE_RE.split(text) if s.strip()]
+
+def dedupe_sentences(sentences: List[str]) -> List[str]:
+    """Drop exact repeats of an earlier sentence (case/punctuation-insensitive); keeps the first."""
+    seen = set()
+    out: List[str] = []
+    for s in sentences:
+        key = " ".join(WORD_RE.findall(s.lower()))
+        if key and key in seen:
+            continue
+        seen.add(key)
+        out.append(s)
+    return out
+
+def split_oversized(sentence: str, max_tokens: int) -> List[str]:
+    """Break a sentence (e.g. an unpunctuated run-on) into word chunks of at most `max_tokens`."""
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    chunks: List[str] = []
+    cur = ""
+    for w in sentence.split():
+        while len(w) > max_chars:                  # a single "word" longer than the budget
+            if cur:
+                chunks.append(cur)
+                cur = ""
+            chunks.append(w[:max_chars])
+            w = w[max_chars:]
+        if cur and len(cur) + 1 + len(w) > max_chars:
+            chunks.append(cur)
+            cur = w
+        else:
+            cur = f"{cur} {w}" if cur else w
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+def score_sentence(sentence: str, term_freq: Counter) -> float:
+    """
+    Local extractive score: commitments ('<Owner> will ...') and due phrases weigh most,
+    then decision cues, then how central the sentence's content words are to the meeting.
+    """
+    s_low = sentence.lower()
+    score = 0.0
+    if split_multi_owner(sentence):
+        score += 3.0
+    if extract_due_phrase(sentence):
+        score += 2.0
+    score += len(set(DECISION_CUE_RE.findall(s_low)))
+    terms = [w for w in WORD_RE.findall(s_low) if w not in STOPWORDS and len(w) > 2]
+    if terms:
+        score += sum(term_freq[w] for w in terms) / (len(terms) * max(term_freq.values(), default=1))
+    return score
+
+def select_sentences(sentences: List[str], token_budget: int) -> List[str]:
+    """
+    Greedily keep the highest-scoring sentences that fit the budget, in original order.
+    Sentences larger than the budget are split first so they compete as smaller pieces.
+    """
+    pieces = [p for s in sentences for p in split_oversized(s, max(1, token_budget - 1))]
+    term_freq = Counter(
+        w for s in pieces for w in WORD_RE.findall(s.lower()) if w not in STOPWORDS and len(w) > 2
+    )
+    ranked = sorted(range(len(pieces)), key=lambda i: score_sentence(pieces[i], term_freq), reverse=True)
+    keep, used = set(), 0
+    for i in ranked:
+        cost = estimate_tokens(pieces[i]) + 1
+        if used + cost > token_budget:
+            continue
+        keep.add(i)
+        used += cost
+    if not keep and ranked:
+        keep.add(ranked[0])                        # budget too small for anything: keep the best piece
+    return [s for i, s in enumerate(pieces) if i in keep]
+
+def compact_transcript(transcript: str, token_budget: Optional[int] = None) -> Tuple[str, CompactionStats]:
+    """
+    Shrink a raw Whisper transcript before it goes into the LLM prompt:
+      1) strip fillers
+      2) collapse Whisper repetition loops and exact repeated sentences
+      3) only if `token_budget` > 0 and still over it, keep the best-scoring sentences
+    Never returns an empty string for non-empty input.
+    Returns the compacted text and per-request token stats.
+    """
+    budget = COMPACTION_TOKEN_BUDGET if token_budget is None else token_budget
+    original = transcript or ""
+    original_tokens = estimate_tokens(original)
+
+    text = strip_fillers(original)
+    total = len(split_sentences(text))          # before loop collapsing, which also removes sentences
+    sentences = dedupe_sentences(split_sentences(collapse_repeats(text)))
+    if budget > 0 and estimate_tokens(" ".join(sentences)) > budget:
+        sentences = select_sentences(sentences, budget)
+    compacted = " ".join(sentences)
+    if not any(ch.isalnum() for ch in compacted):    # nothing but punctuation left
+        compacted = original.strip()
+
+    compacted_tokens = estimate_tokens(compacted)
+    stats = CompactionStats(
+        original_tokens=original_tokens,
+        compacted_tokens=compacted_tokens,
+        tokens_saved=max(0, original_tokens - compacted_tokens),
+        sentences_dropped=max(0, total - len(sentences)),
+        token_budget=budget,
+    )
+    return compacted, stats
@@ -0,0 +1,95 @@
+import os
+import re
+from typing import Optional
+from datetime import datetime, timedelta, date
+from zoneinfo import ZoneInfo
+
+
+# ---------- Owner & due-date helpers ----------
+
+WEEKDAYS = ["monday","tuesday","wednesday","thursday","friday","saturday","sunday"]
+WD2IDX = {d:i for i,d in enumerate(WEEKDAYS)}
+LOCAL_TZ = ZoneInfo("Asia/Kolkata")
+DEFAULT_SPEAKER = os.getenv("DEFAULT_SPEAKER", "You")  # set to your name if you like
+
+def next_weekday(base_dt: date, target_idx: int, *, next_flag: bool=False) -> date:
+    """Return the next occurrence of weekday `target_idx` (0=Mon)."""
+    cur_idx = base_dt.weekday()
+    delta = (target_idx - cur_idx) % 7
+    if delta == 0 or next_flag:
+        delta = 7 if delta == 0 else delta
+    return base_dt + timedelta(days=delta)
+
+def extract_due_phrase(s: str) -> Optional[str]:
+    """Pick a human phrase we recognized; helps keep details readable."""
+    s_low = s.lower()
+    m = re.search(r"\bby\s+(next\s+\w+day|\w+day)\b", s_low)      # by Friday / by next Wednesday
+    if m: return m.group(0)
+    m = re.search(r"\bnext\s+(\w+day)\b", s_low)                  # next Wednesday
+    if m: return m.group(0)
+    m = re.search(r"\bon\s+(\w+day)\b", s_low)                    # on Wednesday
+    if m: return m.group(0)
+    if "tomorrow" in s_low: return "tomorrow"
+    if "today" in s_low: return "today"
+    return None
+
+def resolve_due_date(phrase: Optional[str], now: Optional[datetime] = None) -> Optional[str]:
+    """
+    Convert phrases like 'by Friday', 'next Wednesday', 'tomorrow', 'today'
+    into ISO date (YYYY-MM-DD) in Asia/Kolkata local time.
+    """
+    if not phrase:
+        return None
+    p = phrase.strip().lower()
+    now = now or datetime.now(LOCAL_TZ)
+    base = now.date()
+
+    if "today" in p:
+        return base.isoformat()
+    if "tomorrow" in p:
+        return (base + timedelta(days=1)).isoformat()
+
+    m = re.search(r"(?:by|on)\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)", p)
+    if m:
+        w = m.group(1)
+        return next_weekday(base, WD2IDX[w]).isoformat()
+
+    m = re.search(r"next\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)", p)
+    if m:
+        w = m.group(1)
+        return next_weekday(base, WD2IDX[w], next_flag=True).isoformat()
+
+    m = re.search(r"(monday|tuesday|wednesday|thursday|friday|saturday|sunday)", p)
+    if m:
+        w = m.group(1)
+        return next_weekday(base, WD2IDX[w]).isoformat()
+
+    return None
+
+def split_multi_owner(sentence: str) -> list[tuple[str, str]]:
+    """
+    Extract each '<Owner> will <verb phrase>' separately, even with multiple owners.
+    'I will draft the email and Alice will review it.'
+      -> [('You','draft the email'), ('Alice','review it')]
+    """
+    s = re.sub(r"\s*&\s*", " and ", sentence.strip())
+
+    # non-greedy action capture, stop right before: " and <Owner> will" OR end of sentence
+    pattern = re.compile(
+        r"\b(I|We|[A-Z][a-z]+)\s+will\s+(.+?)(?=(?:\s+and\s+(?:I|We|[A-Z][a-z]+)\s+will\b)|[.;]|$)",
+        flags=re.IGNORECASE
+    )
+
+    pairs: list[tuple[str, str]] = []
+    for m in pattern.finditer(s):
+        owner_raw = m.group(1)
+        action = m.group(2).strip()
+        owner = {"i": DEFAULT_SPEAKER, "we": "Team"}.get(owner_raw.lower(), owner_raw)
+        pairs.append((owner, action))
+    return pairs
+
+
+
+def title_case(s: str) -> str:
+    s = s.strip()
+    return s if not s else s[0].upper() + s[1:]
@@ -0,0 +1,54 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+# Keep the most recent transcripts so /ingest_audio can return an id instead of the
+# full text; clients fetch it with GET /transcripts/{id}. Backed by SQLite (WAL) so
+# every worker process under app.serve sees the same store.
+TRANSCRIPT_CACHE_SIZE = int(os.getenv("TRANSCRIPT_CACHE_SIZE", "256"))
+STATE_DB = os.getenv("STATE_DB", "data/state.db")
+
+_local = threading.local()
+
+
+def _conn() -> sqlite3.Connection:
+    """One connection per thread and per process (never reuse a connection across fork)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "pid", None) != os.getpid():
+        Path(STATE_DB).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(STATE_DB, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            " id TEXT PRIMARY KEY, text TEXT NOT NULL, accessed REAL NOT NULL)"
+        )
+        _local.conn, _local.pid = conn, os.getpid()
+    return conn
+
+def save_transcript(text: str) -> str:
+    """Store a transcript and return its id (least recently used entries are evicted first)."""
+    transcript_id = uuid.uuid4().hex
+    conn = _conn()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("INSERT INTO transcripts (id, text, accessed) VALUES (?, ?, ?)",
+                     (transcript_id, text, time.time()))
+        conn.execute(
+            "DELETE FROM transcripts WHERE id NOT IN"
+            " (SELECT id FROM transcripts ORDER BY accessed DESC LIMIT ?)",
+            (TRANSCRIPT_CACHE_SIZE,),
+        )
+    return transcript_id
+
+def get_transcript(transcript_id: str) -> Optional[str]:
+    conn = _conn()
+    row = conn.execute("SELECT text FROM transcripts WHERE id = ?", (transcript_id,)).fetchone()
+    if row is None:
+        return None
+    conn.execute("UPDATE transcripts SET accessed = ? WHERE id = ?", (time.time(), transcript_id))
+    return row[0]
@@ -1,18 +1,164 @@
-import os, tempfile, subprocess, shlex
+import os, tempfile, subprocess, mmap, struct, threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+import numpy as np
 from faster_whisper import WhisperModel
+from faster_whisper.utils import download_model
+
+TARGET_RATE = 16000
+WHISPER_MODELS = ("small", "tiny")     # preference order used by transcribe()
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def _probe_wav(f, size: int) -> Dict[str, Any]:
+    """Walk RIFF chunks for 'fmt ' and 'data'; no decoding."""
+    info: Dict[str, Any] = {"format": "wav"}
+    f.seek(12)
+    while True:
+        hdr = f.read(8)
+        if len(hdr) < 8:
+            break
+        cid, clen = struct.unpack("<4sI", hdr)
+        if cid == b"fmt ":
+            fmt = f.read(clen)
+            tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+            if tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                tag = struct.unpack("<H", fmt[24:26])[0]        # first 2 bytes of the SubFormat GUID
+            info.update(codec=f"pcm_s{bits}le" if tag == WAVE_FORMAT_PCM else f"wav_0x{tag:04x}",
+                        sample_rate=rate, channels=channels, bits_per_sample=bits)
+            if clen % 2:
+                f.seek(1, os.SEEK_CUR)
+        elif cid == b"data":
+            offset = f.tell()
+            # streaming writers (e.g. ffmpeg to a pipe) may leave 0/0xFFFFFFFF here
+            length = min(clen, size - offset) if clen else size - offset
+            info.update(data_offset=offset, data_bytes=length)
+            break
+        else:
+            f.seek(clen + (clen % 2), os.SEEK_CUR)
+    if info.get("sample_rate") and info.get("data_bytes") is not None and info.get("bits_per_sample"):
+        frame = info["channels"] * info["bits_per_sample"] // 8
+        info["duration"] = round(info["data_bytes"] / frame / info["sample_rate"], 3) if frame else None
+    return info
+
+def _probe_flac(f) -> Dict[str, Any]:
+    """Read the STREAMINFO block (always the first metadata block)."""
+    f.seek(4)
+    hdr = f.read(4)
+    info: Dict[str, Any] = {"format": "flac", "codec": "flac"}
+    if len(hdr) < 4 or (hdr[0] & 0x7F) != 0:
+        return info
+    si = f.read(34)
+    if len(si) < 18:
+        return info
+    packed = int.from_bytes(si[10:18], "big")
+    rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    bits = ((packed >> 36) & 0x1F) + 1
+    total = packed & 0xFFFFFFFFF
+    info.update(sample_rate=rate, channels=channels, bits_per_sample=bits,
+                duration=round(total / rate, 3) if rate and total else None)
+    return info
+
+def probe_audio(path: str) -> Dict[str, Any]:
+    """
+    In-process header sniff (replaces a separate ffprobe fork).
+    Full stream info for WAV/FLAC; other containers are only identified.
+    `compliant` means Whisper can take it as-is (16k mono) without ffmpeg.
+    Malformed headers are reported as `probe_error` with `compliant=False`,
+    so the ffmpeg fallback gets a chance at the file.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            try:
+                info = _probe_wav(f, size)
+            except (struct.error, ValueError) as e:
+                info = {"format": "wav", "probe_error": f"bad WAV header: {e}"}
+        elif head[:4] == b"fLaC":
+            try:
+                info = _probe_flac(f)
+            except (struct.error, ValueError) as e:
+                info = {"format": "flac", "probe_error": f"bad FLAC header: {e}"}
+        elif head[:4] == b"OggS":
+            info = {"format": "ogg"}
+        elif head[4:8] == b"ftyp":
+            info = {"format": "mp4"}
+        elif head[:4] == b"\x1a\x45\xdf\xa3":
+            info = {"format": "matroska/webm"}
+        elif head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+            info = {"format": "mp3"}
+        else:
+            info = {"format": "unknown"}
+    mono16k = info.get("sample_rate") == TARGET_RATE and info.get("channels") == 1
+    if "probe_error" in info:
+        info["compliant"] = False
+    elif info["format"] == "wav":
+        info["compliant"] = mono16k and info.get("codec") == "pcm_s16le" and "data_offset" in info
+    else:
+        info["compliant"] = mono16k and info["format"] == "flac"
+    info["size_bytes"] = size
+    return info
+
+def _load_pcm16_mmap(path: str, offset: int, nbytes: int) -> np.ndarray:
+    """Memory-map the PCM payload and convert straight to Whisper's float32 input."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pcm = np.frombuffer(mm, dtype="<i2", count=nbytes // 2, offset=offset)   # view, no copy
+        audio = pcm.astype(np.float32)
+        del pcm                                                                   # release the mmap export
+    audio *= 1.0 / 32768.0
+    return audio
 
 def _ffmpeg_resample(src_path: str) -> str:
-    """Force 16k mono wav via ffmpeg into a temp file and return its path."""
-    tmp_wav = tempfile.NamedTemporaryFile(suffix="_16k.wav", delete=False).name
-    cmd = f"ffmpeg -y -hide_banner -loglevel error -i {shlex.quote(src_path)} -ac 1 -ar 16000 {shlex.quote(tmp_wav)}"
-    subprocess.run(cmd, shell=True, check=True)
+    """Force 16k mono wav via a single ffmpeg call (no shell) into a temp file and return its path."""
+    fd, tmp_wav = tempfile.mkstemp(suffix="_16k.wav")
+    os.close(fd)
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+           "-i", src_path, "-ac", "1", "-ar", str(TARGET_RATE), "-c:a", "pcm_s16le", tmp_wav]
+    try:
+        subprocess.run(cmd, check=True)
+    except Exception:
+        os.remove(tmp_wav)
+        raise
     return tmp_wav
 
-def _run_whisper(model_name: str, wav_path: str) -> str:
-    model = WhisperModel(model_name, device="cpu", compute_type="int8")
+# ---------- Model cache ----------
+# Models are loaded once per process. Under app.serve the master only resolves/downloads
+# the weight files before forking: CTranslate2 starts its worker threads in the model
+# constructor and threads do not survive fork(), so each worker loads its own instance
+# with a thread count sized to its CPU slice.
+_model_paths: Dict[str, str] = {}
+_models: Dict[str, WhisperModel] = {}
+_models_lock = threading.Lock()
+
+def resolve_model_files(names: Iterable[str] = WHISPER_MODELS) -> Dict[str, str]:
+    """
+    Download (if needed) and remember the local weight-file paths so workers never hit the hub
+    or race on the cache. This does not load the models: each process still loads its own copy.
+    """
+    for name in names:
+        if name not in _model_paths:
+            _model_paths[name] = download_model(name)
+    return dict(_model_paths)
+
+def get_model(model_name: str) -> WhisperModel:
+    with _models_lock:
+        model = _models.get(model_name)
+        if model is None:
+            model = WhisperModel(
+                _model_paths.get(model_name, model_name),
+                device="cpu",
+                compute_type="int8",
+                cpu_threads=int(os.getenv("WHISPER_CPU_THREADS", "0")),   # 0 = CTranslate2 default (all cores)
+            )
+            _models[model_name] = model
+        return model
+
+def _run_whisper(model_name: str, audio) -> str:
+    model = get_model(model_name)
     segments, _ = model.transcribe(
-        wav_path,
-        vad_filter=True,           
+        audio,
+        vad_filter=True,
         language="en",
         beam_size=5, best_of=5,    # better decoding
         temperature=0.2,           # allows minor exploration for clarity
@@ -21,15 +167,35 @@ def _run_whisper(model_name: str, wav_path: str) -> str:
     text = " ".join(seg.text.strip() for seg in segments).strip()
     return text
 
-def transcribe(audio_path: str) -> str:
-    wav16k = _ffmpeg_resample(audio_path)
+def transcribe_with_probe(audio_path: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Transcribe and return the probe info from the same pass.
+    Compliant 16k mono PCM WAV is memory-mapped and fed to Whisper directly,
+    compliant FLAC is handed to Whisper by path; only other inputs fork ffmpeg.
+    """
+    probe = probe_audio(audio_path)
+    tmp_wav: Optional[str] = None
+    if probe["compliant"] and probe["format"] == "wav":
+        audio = _load_pcm16_mmap(audio_path, probe["data_offset"], probe["data_bytes"])
+    elif probe["compliant"]:
+        audio = audio_path
+    else:
+        tmp_wav = _ffmpeg_resample(audio_path)
+        audio = tmp_wav
+    probe["fast_path"] = tmp_wav is None
+    probe["forks"] = 0 if tmp_wav is None else 1
     try:
         # Prefer 'small' first (better accuracy); fall back to 'tiny' for speed
-        text = _run_whisper("small", wav16k)
+        text = _run_whisper("small", audio)
         if not text:
-            text = _run_whisper("tiny", wav16k)
+            text = _run_whisper("tiny", audio)
         if not text:
             raise ValueError("Whisper produced no text.")
-        return text
+        return text, probe
     finally:
-        os.remove(wav16k)
\ No newline at end of file
+        if tmp_wav:
+            os.remove(tmp_wav)
+
+def transcribe(audio_path: str) -> str:
+    text, _ = transcribe_with_probe(audio_path)
+    return text
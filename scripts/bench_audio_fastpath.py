@@ -0,0 +1,75 @@
+"""
+Compare audio preparation before Whisper (model time excluded):
+  legacy_ingest : shell ffmpeg re-encode to a temp wav (old /ingest_audio)
+  legacy_debug  : ffprobe fork + shell ffmpeg re-encode (old /debug_transcribe)
+  fast          : in-process header probe + mmap of the PCM payload (ffmpeg only if non-compliant)
+
+Forks are measured, not assumed: every process spawned through subprocess.Popen
+(which run/check_output use) is counted. For the legacy shell=True call that counts
+/bin/sh only; the ffmpeg that sh starts is not seen, so legacy forks are a lower bound.
+A path whose tools are missing from PATH is reported as skipped instead of timed.
+
+Usage: python -m scripts.bench_audio_fastpath [audio ...] [--runs N]
+"""
+import argparse, json, os, shlex, shutil, subprocess, tempfile, time
+from app.services.transcription import probe_audio, _load_pcm16_mmap, _ffmpeg_resample
+
+_spawned = 0
+
+class _CountingPopen(subprocess.Popen):
+    def __init__(self, *args, **kwargs):
+        global _spawned
+        _spawned += 1
+        super().__init__(*args, **kwargs)
+
+subprocess.Popen = _CountingPopen
+
+def legacy_ingest(path: str) -> None:
+    tmp_wav = tempfile.NamedTemporaryFile(suffix="_16k.wav", delete=False).name
+    cmd = f"ffmpeg -y -hide_banner -loglevel error -i {shlex.quote(path)} -ac 1 -ar 16000 {shlex.quote(tmp_wav)}"
+    subprocess.run(cmd, shell=True, check=True)
+    os.remove(tmp_wav)
+
+def legacy_debug(path: str) -> None:
+    subprocess.check_output(["ffprobe", "-hide_banner", "-loglevel", "error",
+                             "-show_streams", "-select_streams", "a", "-of", "json", path], text=True)
+    legacy_ingest(path)
+
+def fast_prepare(path: str) -> None:
+    probe = probe_audio(path)
+    if probe["compliant"] and probe["format"] == "wav":
+        _load_pcm16_mmap(path, probe["data_offset"], probe["data_bytes"])
+    elif not probe["compliant"]:
+        os.remove(_ffmpeg_resample(path))
+
+def bench(fn, path: str, runs: int, needs: tuple) -> dict:
+    missing = [tool for tool in needs if not shutil.which(tool)]
+    if missing:
+        return {"skipped": f"{', '.join(missing)} not on PATH"}
+    global _spawned
+    _spawned = 0
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(path)
+    return {"ms": round((time.perf_counter() - start) / runs * 1000, 2), "forks": _spawned / runs}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("audio", nargs="*", default=["data/meetings/sample16k.wav", "data/meetings/sample_meeting.wav"])
+    ap.add_argument("--runs", type=int, default=20)
+    args = ap.parse_args()
+    for path in args.audio:
+        fast_needs = () if probe_audio(path)["compliant"] else ("ffmpeg",)
+        result = {
+            "file": path,
+            "legacy_ingest": bench(legacy_ingest, path, args.runs, ("ffmpeg",)),
+            "legacy_debug": bench(legacy_debug, path, args.runs, ("ffprobe", "ffmpeg")),
+            "fast": bench(fast_prepare, path, args.runs, fast_needs),
+        }
+        for name in ("legacy_ingest", "legacy_debug"):
+            if "forks" in result[name] and "forks" in result["fast"]:
+                result[f"forks_saved_vs_{name}"] = result[name]["forks"] - result["fast"]["forks"]
+        print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
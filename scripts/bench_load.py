@@ -0,0 +1,110 @@
+"""
+Throughput vs. worker count for app.serve.
+
+For each worker count this starts `python -m app.serve --workers N`, waits for /health,
+warms up until every worker pid (x-worker-pid header) has served a request - so each
+worker has loaded its Whisper model before measuring - then keeps `--concurrency` clients
+busy for `--duration` seconds and reports req/s.
+
+  --endpoint transcribe : upload the audio file to /debug_transcribe (Whisper-bound, default)
+  --endpoint health     : GET /health (serving overhead only, no models needed)
+
+Usage: python -m scripts.bench_load --workers 1 2 4 --concurrency 8 --duration 60
+"""
+import argparse, asyncio, json, subprocess, sys, time
+from pathlib import Path
+import httpx
+
+def wait_healthy(base: str, timeout: float = 600) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"server at {base} did not become healthy")
+
+async def run_load(base: str, endpoint: str, audio: bytes, workers: int, concurrency: int,
+                   duration: float, warmup_timeout: float = 600) -> dict:
+    latencies, errors, pids = [], 0, set()
+
+    async def one(client: httpx.AsyncClient, slot: int) -> float:
+        start = time.perf_counter()
+        if endpoint == "transcribe":
+            # one file name per client slot: requests in a slot are sequential, so uploads never collide
+            files = {"file": (f"loadtest-{slot}.wav", audio, "audio/wav")}
+            r = await client.post(f"{base}/debug_transcribe", files=files)
+        else:
+            r = await client.get(f"{base}/health")
+        r.raise_for_status()
+        pids.add(r.headers.get("x-worker-pid"))
+        return time.perf_counter() - start
+
+    async with httpx.AsyncClient(timeout=600) as client:
+        # the first request per worker pays the model load: keep warming until all workers answered
+        deadline = time.perf_counter() + warmup_timeout
+        while len(pids) < workers and time.perf_counter() < deadline:
+            await asyncio.gather(*(one(client, i) for i in range(max(workers, concurrency))))
+        warmed = len(pids)
+        stop_at = time.perf_counter() + duration
+
+        async def worker(slot: int) -> None:
+            nonlocal errors
+            while time.perf_counter() < stop_at:
+                try:
+                    latencies.append(await one(client, slot))
+                except httpx.HTTPError:
+                    errors += 1
+
+        pids.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "req_per_s": round(len(latencies) / elapsed, 3),
+        "p50_s": round(latencies[len(latencies) // 2], 4) if latencies else None,
+        "p95_s": round(latencies[int(len(latencies) * 0.95) - 1], 4) if latencies else None,
+        "workers_warmed": warmed,
+        "workers_serving": len(pids),
+    }
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=60)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--endpoint", choices=("transcribe", "health"), default="transcribe")
+    ap.add_argument("--audio", default="data/meetings/sample16k.wav")
+    args = ap.parse_args()
+
+    audio = Path(args.audio).read_bytes() if args.endpoint == "transcribe" else b""
+    base = f"http://127.0.0.1:{args.port}"
+    baseline = None
+    for n in args.workers:
+        cmd = [sys.executable, "-m", "app.serve", "--workers", str(n),
+               "--port", str(args.port), "--log-level", "warning"]
+        if args.endpoint == "health":
+            cmd.append("--no-model-download")
+        proc = subprocess.Popen(cmd)
+        try:
+            wait_healthy(base)
+            result = asyncio.run(run_load(base, args.endpoint, audio, n, args.concurrency, args.duration))
+        finally:
+            proc.terminate()
+            proc.wait()
+        baseline = baseline or result["req_per_s"]
+        result.update(workers=n, speedup=round(result["req_per_s"] / baseline, 2) if baseline else None)
+        print(json.dumps(result), flush=True)
+
+    for slot in range(max(args.concurrency, max(args.workers))):
+        Path(f"data/meetings/loadtest-{slot}.wav").unlink(missing_ok=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from collections import Counter
+
+from app.services.compaction import (
+    collapse_repeats,
+    compact_transcript,
+    score_sentence,
+    strip_fillers,
+)
+
+
+# ---------- fillers ----------
+
+def test_strip_fillers_removes_disfluencies():
+    assert strip_fillers("Um, so, uh, we ship on Friday.") == "so, we ship on Friday."
+    assert strip_fillers("We ship, uh.") == "We ship."
+
+def test_strip_fillers_keeps_content_phrases():
+    for s in (
+        "I will let you know by Friday.",
+        "Do you know who owns the rollout?",
+        "What I mean is the API is late.",
+        "Loop in the ER team.",
+    ):
+        assert strip_fillers(s) == s
+
+def test_strip_fillers_keeps_units_and_backchannels():
+    for s in (
+        "The bolt is 5 mm wide.",
+        "We need 10 mm, 20 mm, and 30 mm parts.",
+        "Mm-hmm, sounds good.",
+        "Uh-huh.",
+    ):
+        assert strip_fillers(s) == s
+
+def test_filler_only_input_falls_back_to_original():
+    out, _ = compact_transcript("Hmm.")
+    assert out == "Hmm."
+
+def test_strip_fillers_comma_delimited_phrases():
+    assert strip_fillers("The demo, you know, went fine.") == "The demo went fine."
+    assert strip_fillers("I mean, the demo went fine.") == "the demo went fine."
+
+
+# ---------- Whisper loops ----------
+
+def test_collapse_repeats_keeps_real_doubles():
+    for s in ("Bye bye. I think we are done.", "She had had enough.", "I said that that was fine."):
+        assert collapse_repeats(s) == s
+
+def test_collapse_repeats_collapses_loops_and_keeps_punctuation():
+    assert collapse_repeats("Thank you. Thank you. Thank you. Next item.") == "Thank you. Next item."
+    assert collapse_repeats("we we we we need this") == "we need this"
+
+def test_collapse_repeats_keeps_repeated_numbers():
+    for s in ("Call 555 555 555 now.", "Rows 1 1 1 1 are all ones."):
+        assert collapse_repeats(s) == s
+
+
+# ---------- dedupe / budget ----------
+
+def test_numbers_distinguish_sentences():
+    text = "The budget for Q3 is 5000 dollars. The budget for Q4 is 8000 dollars. Alice will send it by 12 March."
+    out, _ = compact_transcript(text)
+    assert "Q4 is 8000" in out and "Q3 is 5000" in out and "12 March" in out
+
+def test_numbered_items_are_not_deduped():
+    text = " ".join(f"Item {i} Alice will draft part {i} by Friday." for i in range(50))
+    out, stats = compact_transcript(text)
+    assert out == text
+    assert stats.sentences_dropped == 0
+
+def test_sentences_dropped_counts_collapsed_loops():
+    text = "Alice will do X by Friday. " * 3 + "Bob will do Y. " * 3
+    out, stats = compact_transcript(text)
+    assert out == "Alice will do X by Friday. Bob will do Y."
+    assert stats.sentences_dropped == 4
+
+def test_no_ranking_by_default():
+    text = " ".join(f"Point {i} about the roadmap was discussed at length today." for i in range(2000))
+    out, stats = compact_transcript(text)
+    assert out == text
+    assert stats.token_budget == 0
+
+def test_run_on_sentence_is_never_emptied():
+    text = " ".join(["alice will review the launch plan and the budget numbers"] * 400 + ["done"])
+    text = " ".join(f"{w}{i}" for i, w in enumerate(text.split()))       # no loops, no punctuation
+    out, stats = compact_transcript(text, token_budget=500)
+    assert out
+    assert 0 < stats.compacted_tokens <= 500
+
+def test_non_empty_input_never_compacts_to_empty():
+    out, _ = compact_transcript("Um, uh.")
+    assert out
+
+
+# ---------- scoring ----------
+
+def test_decision_cues_match_whole_words_once():
+    tf = Counter()
+    assert score_sentence("We agreed.", tf) == score_sentence("We agree.", tf)
+    assert score_sentence("William found residue in goodwill.", tf) == 0
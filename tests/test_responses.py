@@ -0,0 +1,85 @@
+import threading
+import warnings
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app import main
+from app.services import transcript_store
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcript_store, "STATE_DB", str(tmp_path / "state.db"))
+    monkeypatch.setattr(transcript_store, "_local", threading.local())
+    return TestClient(main.app)
+
+
+# ---------- _project / _check_fields ----------
+
+PAYLOAD = {"insights": {"summary": "s", "decisions": ["d"]}, "actions": [{"title": "t"}]}
+
+def test_project_nested_and_top_level():
+    assert main._project(PAYLOAD, "insights.summary,actions") == {
+        "insights": {"summary": "s"},
+        "actions": [{"title": "t"}],
+    }
+    assert main._project(PAYLOAD, None) is PAYLOAD
+
+@pytest.mark.parametrize("fields", ["insights.bogus", "actions.title", "transcript"])
+def test_project_unknown_fields_are_422(fields):
+    with pytest.raises(HTTPException) as exc:
+        main._project(PAYLOAD, fields)
+    assert exc.value.status_code == 422
+
+def test_check_fields_uses_profile():
+    main._check_fields("transcript", main.INGEST_FIELDS["full"])
+    with pytest.raises(HTTPException) as exc:
+        main._check_fields("transcript", main.INGEST_FIELDS["compact"])
+    assert exc.value.status_code == 422
+
+
+# ---------- routes ----------
+
+def test_ingest_audio_rejects_unknown_fields_before_transcribing(client, monkeypatch):
+    monkeypatch.setattr(main, "transcribe", lambda *_: pytest.fail("should not transcribe"))
+    r = client.post("/ingest_audio", params={"fields": "transcript"},
+                    files={"file": ("x.wav", b"RIFF", "audio/wav")})
+    assert r.status_code == 422
+
+def test_act_on_text_rejects_unknown_fields_before_analysis(client, monkeypatch):
+    monkeypatch.setattr(main, "analyze_stub", lambda *_: pytest.fail("should not analyze"))
+    r = client.post("/act_on_text", params={"fields": "insights,bogus"}, json={"transcript": "hi"})
+    assert r.status_code == 422
+
+def test_act_on_text_projection(client, monkeypatch):
+    monkeypatch.setattr(main, "analyze_stub", lambda *_: main.Insights(summary="s", decisions=["d"]))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")          # no deprecated response classes on the hot path
+        r = client.post("/act_on_text", params={"fields": "insights.summary"}, json={"transcript": "hi"})
+    assert r.status_code == 200
+    assert r.json() == {"insights": {"summary": "s"}}
+
+def test_transcript_by_id(client):
+    transcript_id = transcript_store.save_transcript("hello world")
+    r = client.get(f"/transcripts/{transcript_id}")
+    assert r.status_code == 200
+    assert r.json() == {"transcript_id": transcript_id, "transcript": "hello world"}
+
+def test_unknown_transcript_id_is_404(client):
+    assert client.get("/transcripts/does-not-exist").status_code == 404
+
+@pytest.mark.parametrize("profile,expected", [
+    ("compact", {"file_path", "transcript_id", "insights", "actions", "task_owners"}),
+    ("full", {"file_path", "transcript_id", "insights", "actions", "task_owners",
+              "transcript", "summary", "decisions", "action_items"}),
+])
+def test_ingest_audio_profiles(client, monkeypatch, tmp_path, profile, expected):
+    monkeypatch.chdir(tmp_path)                  # uploads are saved under ./data/meetings
+    monkeypatch.setattr(main, "transcribe", lambda *_: "we ship friday")
+    monkeypatch.setattr(main, "analyze_stub", lambda *_: main.Insights(summary="s"))
+    r = client.post("/ingest_audio", params={"profile": profile},
+                    files={"file": ("x.wav", b"RIFF", "audio/wav")})
+    assert r.status_code == 200
+    assert set(r.json()) == expected
@@ -0,0 +1,47 @@
+import struct
+from pathlib import Path
+
+from app.services.transcription import probe_audio
+
+SAMPLES = Path(__file__).resolve().parent.parent / "data" / "meetings"
+
+
+def _flac_header(rate: int, channels: int, bits: int, total: int) -> bytes:
+    packed = (rate << 44) | ((channels - 1) << 41) | ((bits - 1) << 36) | total
+    streaminfo = b"\0" * 10 + packed.to_bytes(8, "big") + b"\0" * 16
+    return b"fLaC" + bytes([0x80, 0, 0, len(streaminfo)]) + streaminfo
+
+
+def test_probe_compliant_wav():
+    info = probe_audio(str(SAMPLES / "sample16k.wav"))
+    assert info["format"] == "wav" and info["codec"] == "pcm_s16le"
+    assert info["sample_rate"] == 16000 and info["channels"] == 1
+    assert info["compliant"] is True
+    assert info["data_offset"] + info["data_bytes"] == info["size_bytes"]
+
+def test_probe_non_compliant_wav():
+    info = probe_audio(str(SAMPLES / "sample_meeting.wav"))
+    assert info["sample_rate"] == 22050
+    assert info["compliant"] is False
+
+def test_probe_short_fmt_chunk_falls_back(tmp_path):
+    path = tmp_path / "short_fmt.wav"
+    path.write_bytes(b"RIFF\0\0\0\0WAVE" + b"fmt " + struct.pack("<I", 4) + b"\1\0\1\0"
+                     + b"data" + struct.pack("<I", 4) + b"\0" * 4)
+    info = probe_audio(str(path))
+    assert "probe_error" in info
+    assert info["compliant"] is False
+
+def test_probe_flac_streaminfo(tmp_path):
+    path = tmp_path / "ok.flac"
+    path.write_bytes(_flac_header(16000, 1, 16, 32000))
+    info = probe_audio(str(path))
+    assert (info["sample_rate"], info["channels"], info["duration"]) == (16000, 1, 2.0)
+    assert info["compliant"] is True
+
+def test_probe_truncated_flac(tmp_path):
+    path = tmp_path / "truncated.flac"
+    path.write_bytes(_flac_header(16000, 1, 16, 32000)[:14])
+    info = probe_audio(str(path))
+    assert info["format"] == "flac"
+    assert info["compliant"] is False